@@ -8,15 +8,26 @@ from phone_agent.adb.connection import (
     quick_connect,
 )
 from phone_agent.adb.device import (
+    DeviceHandle,
+    aget_current_app,
+    aswipe,
+    atap,
     back,
+    device_sequence,
     double_tap,
+    enable_tcp,
+    gather_devices,
     get_current_app,
+    get_device,
     home,
+    invalidate_device_cache,
     launch_app,
     long_press,
+    on_device_reconnect,
     sleep_screen,
     swipe,
     tap,
+    tap_many,
     unlock_screen,
     wake_screen,
 )
@@ -37,8 +48,11 @@ __all__ = [
     "detect_and_set_adb_keyboard",
     "restore_keyboard",
     # Device control
+    "DeviceHandle",
+    "get_device",
     "get_current_app",
     "tap",
+    "tap_many",
     "swipe",
     "back",
     "home",
@@ -48,6 +62,15 @@ __all__ = [
     "wake_screen",
     "sleep_screen",
     "unlock_screen",
+    "invalidate_device_cache",
+    "on_device_reconnect",
+    "enable_tcp",
+    "device_sequence",
+    # Async device control
+    "atap",
+    "aswipe",
+    "aget_current_app",
+    "gather_devices",
     # Connection management
     "ADBConnection",
     "DeviceInfo",
@@ -1,158 +1,605 @@
 """Device control utilities for Android automation."""
 
+import asyncio
+import atexit
+import contextlib
+import functools
 import logging
 import os
 import random
+import re
+import shlex
 import subprocess
+import threading
 import time
-from typing import List, Optional, Tuple
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterator, List, Optional, Tuple
 
+try:
+    import ahocorasick
+except ImportError:  # Optional: pip install "phone-agent[fast]"
+    ahocorasick = None
+
+from phone_agent.adb.connection import ADBConnection
 from phone_agent.config.apps import APP_PACKAGES
 from phone_agent.config.timing import TIMING_CONFIG
 
 _logger = logging.getLogger(__name__)
 
-# Cache for device info
-_device_cache: dict = {}
 
+@dataclass(frozen=True, slots=True)
+class DeviceHandle:
+    """
+    Resolved per-device state, computed once and reused by the device helpers.
 
-def _is_device_rooted(device_id: str | None = None) -> bool:
-    """Check if device has root access."""
-    cache_key = f"rooted_{device_id}"
-    if cache_key in _device_cache:
-        return _device_cache[cache_key]
+    Every helper that takes a ``device_id`` also accepts a handle, which skips the
+    per-call prefix, root, touch device and resolution lookups on hot paths.
+    """
 
-    adb_prefix = _get_adb_prefix(device_id)
-    result = subprocess.run(
-        adb_prefix + ["shell", "su", "-c", "id"], capture_output=True, text=True
+    device_id: str | None
+    adb_prefix: tuple[str, ...]
+    rooted: bool
+    touch_device: str | None
+    width: int
+    height: int
+
+    def __str__(self) -> str:
+        return self.device_id or "default"
+
+
+class _DeviceCache:
+    """
+    Size-bounded cache for per-device info with time-based expiry.
+
+    Keys are ``(kind, device_id)`` tuples. Entries expire after the configured
+    device cache TTL, and the oldest entry is evicted once ``maxsize`` is reached.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._entries: dict[tuple[str, str | None], tuple[Any, float]] = {}
+
+    def get(self, key: tuple[str, str | None], default: Any = None) -> Any:
+        """Return the cached value for ``key``, or ``default`` if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        value, expires_at = entry
+        if time.monotonic() >= expires_at:
+            self._entries.pop(key, None)
+            return default
+        return value
+
+    def set(self, key: tuple[str, str | None], value: Any) -> None:
+        """Store ``value`` under ``key``, evicting the oldest entry if full."""
+        self._entries.pop(key, None)
+        while len(self._entries) >= self.maxsize:
+            self._entries.pop(next(iter(self._entries)))
+        expires_at = time.monotonic() + TIMING_CONFIG.device.device_cache_ttl
+        self._entries[key] = (value, expires_at)
+
+    def invalidate(self, device_id: str | None = None, all_devices: bool = False) -> None:
+        """Drop entries for one device, or every entry if ``all_devices`` is set."""
+        if all_devices:
+            self._entries.clear()
+            return
+        for key in [k for k in self._entries if k[1] == device_id]:
+            self._entries.pop(key, None)
+
+
+# Cache for device info
+_device_cache = _DeviceCache()
+
+# Persistent shell sessions, keyed by device ID
+_shells: dict[str | None, "_AdbShell"] = {}
+
+# Whether `adb start-server` has been run by this process
+_server_started = False
+
+# Serial of the single attached device, used when no device ID is given
+_default_serial: str | None = None
+
+# Monotonic time before which a failed default device lookup is not repeated
+_default_retry_at = 0.0
+
+# Seconds a "no device" or "several devices" lookup result is remembered for
+_DEFAULT_DEVICE_RETRY = 2.0
+
+# Network serials ("ip:port") that replace device IDs after enable_tcp()
+_tcp_aliases: dict[str | None, str] = {}
+
+# Settle delays owed by devices inside device_sequence(), run on the device before
+# their next command instead of sleeping on the host
+_pending_delays: dict[str | None, float] = {}
+
+# Marker echoed after every command sent to a persistent shell
+_SHELL_SENTINEL = b"__END__"
+
+# subprocess kwargs for fire-and-forget commands whose output is never read
+_QUIET = {"stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL}
+
+# Linux input event constants used by sendevent taps
+EV_SYN, EV_KEY, EV_ABS = 0, 1, 3
+SYN_REPORT, BTN_TOUCH = 0, 330
+ABS_MT_TRACKING_ID, ABS_MT_POSITION_X, ABS_MT_POSITION_Y = 57, 53, 54
+ABS_MT_TOUCH_MAJOR, ABS_MT_PRESSURE = 48, 58
+
+# On-device script that plays one sendevent tap from positional arguments, so each
+# tap only ships its numbers instead of the whole event sequence
+_TAP_SCRIPT_PATH = "/data/local/tmp/phone_agent_tap.sh"
+_TAP_SCRIPT = f"""\
+# Usage: {_TAP_SCRIPT_PATH} DEVICE X Y PRESSURE TOUCH_MAJOR [MICRO_X MICRO_Y]
+set -e
+d="$1"
+sendevent "$d" {EV_ABS} {ABS_MT_TRACKING_ID} 0
+sendevent "$d" {EV_ABS} {ABS_MT_POSITION_X} "$2"
+sendevent "$d" {EV_ABS} {ABS_MT_POSITION_Y} "$3"
+sendevent "$d" {EV_ABS} {ABS_MT_TOUCH_MAJOR} "$5"
+sendevent "$d" {EV_ABS} {ABS_MT_PRESSURE} "$4"
+sendevent "$d" {EV_KEY} {BTN_TOUCH} 1
+sendevent "$d" {EV_SYN} {SYN_REPORT} 0
+if [ -n "$6" ]; then
+  sendevent "$d" {EV_ABS} {ABS_MT_POSITION_X} "$6"
+  sendevent "$d" {EV_ABS} {ABS_MT_POSITION_Y} "$7"
+  sendevent "$d" {EV_SYN} {SYN_REPORT} 0
+fi
+sendevent "$d" {EV_ABS} {ABS_MT_TRACKING_ID} -1
+sendevent "$d" {EV_KEY} {BTN_TOUCH} 0
+sendevent "$d" {EV_SYN} {SYN_REPORT} 0
+"""
+
+# First known package on a window focus line (longest first so prefixes don't shadow)
+_PKG_RE = re.compile(
+    rb"(?:mCurrentFocus|mFocusedApp).*?("
+    + b"|".join(
+        re.escape(p.encode()) for p in sorted(set(APP_PACKAGES.values()), key=len, reverse=True)
     )
-    rooted = result.returncode == 0 and "uid=0" in result.stdout
-    _device_cache[cache_key] = rooted
+    + b")"
+)
+# Package -> app name, keeping the first name listed for shared packages
+_PKG_TO_NAME = {package.encode(): name for name, package in reversed(APP_PACKAGES.items())}
+
+# Window focus lines of `dumpsys window`, filtered on the device
+_FOCUS_CMD = "dumpsys window | grep -E 'mCurrentFocus|mFocusedApp'"
+
+
+def _build_pkg_automaton() -> Any:
+    """Build an Aho-Corasick automaton mapping known packages to app names."""
+    automaton = ahocorasick.Automaton()
+    for package, name in _PKG_TO_NAME.items():
+        automaton.add_word(package.decode(), name)
+    automaton.make_automaton()
+    return automaton
+
+
+# Single-pass package matcher, used instead of _PKG_RE when pyahocorasick is installed
+_PKG_AUTOMATON = _build_pkg_automaton() if ahocorasick is not None else None
+
+# Keep only device headers and ABS_MT_POSITION_X lines of `getevent -pl` on the device
+_TOUCH_PROBE_CMD = "getevent -pl | grep -e '^add device' -e ABS_MT_POSITION_X"
+# First device header directly followed by its ABS_MT_POSITION_X line in the filtered output
+_TOUCH_DEVICE_RE = re.compile(rb"^add device \d+: (\S+).*\n.*ABS_MT_POSITION_X", re.MULTILINE)
+# `wm size` output, e.g. "Physical size: 1080x2400"
+_RESOLUTION_RE = re.compile(rb"size.*?:\s*(\d+)x(\d+)", re.IGNORECASE)
+
+# Device-side checks for screen and keyguard state. grep -q stops reading at the
+# first match.
+_SCREEN_ON_TEST = "dumpsys power | grep -qE 'mWakefulness=Awake|Display Power: state=ON'"
+_LOCKED_TEST = "dumpsys window | grep -qE 'mDreamingLockscreen=true|isStatusBarKeyguard=true'"
+# Scripts that act on the screen state and echo the outcome as their last word
+_WAKE_SCRIPT = (
+    f"if {_SCREEN_ON_TEST}; then echo ON; "
+    "else input keyevent KEYCODE_WAKEUP; sleep 0.5; echo WOKE; fi"
+)
+_SLEEP_SCRIPT = (
+    f"if {_SCREEN_ON_TEST}; then input keyevent KEYCODE_SLEEP; sleep 0.3; echo SLEPT; "
+    "else echo OFF; fi"
+)
+
+
+class _AdbShell:
+    """
+    Long-lived ``adb shell`` session for a single device.
+
+    Commands are written to the shell's stdin and their output is read back up to
+    a sentinel line, so each call avoids spawning a new adb client and opening a
+    fresh shell transport. Output is returned as raw bytes; parsers match on byte
+    patterns instead of decoding large dumps.
+    """
+
+    def __init__(self, device_id: str | None = None):
+        self.device_id = device_id
+        self._lock = threading.Lock()
+        # Commands submitted without waiting whose sentinels are still unread
+        self._unread = 0
+        _ensure_server()
+        self.proc = subprocess.Popen(
+            [*_get_adb_prefix(device_id), "shell"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+        )
+
+    def is_alive(self) -> bool:
+        """Return True while the underlying adb process is running."""
+        return self.proc.poll() is None
+
+    def run(self, cmd: str, quiet: bool = False, wait: bool = True) -> tuple[int, bytes]:
+        """
+        Run a command in the shell and wait for it to finish.
+
+        A settle delay pending from device_sequence() is run on the device first.
+
+        Args:
+            cmd: Command line, already quoted for the device shell.
+            quiet: If True, discard the command's output on the device.
+            wait: If False, return as soon as the command is submitted. Its
+                completion is read back by the next waiting call.
+
+        Returns:
+            Tuple of (return code, combined stdout/stderr). The return code is -1
+            if the session ended before the command completed, and 0 if the
+            command was not waited for.
+        """
+        pending = _pending_delays.get(self.device_id)
+        if pending:
+            _pending_delays[self.device_id] = 0.0
+            cmd = f"sleep {pending:.3f}; {cmd}"
+        redirect = b">/dev/null 2>&1" if quiet else b"2>&1"
+        # Group the command so stdin never reaches it and stderr is merged
+        script = b"{ %s\n} </dev/null %s; echo %s$?\n" % (cmd.encode(), redirect, _SHELL_SENTINEL)
+        with self._lock:
+            try:
+                self.proc.stdin.write(script)
+                self.proc.stdin.flush()
+            except OSError:
+                return -1, b""
+            if not wait:
+                self._unread += 1
+                return 0, b""
+
+            lines = []
+            while True:
+                line = self.proc.stdout.readline()
+                if not line:
+                    return -1, b"".join(lines)
+                index = line.rfind(_SHELL_SENTINEL)
+                if index != -1 and self._unread:
+                    # Completion of an earlier command that was not waited for
+                    self._unread -= 1
+                    lines = []
+                    continue
+                if index != -1:
+                    lines.append(line[:index])
+                    code = line[index + len(_SHELL_SENTINEL) :].strip()
+                    return (int(code) if code.isdigit() else -1), b"".join(lines)
+                lines.append(line)
+
+    def close(self) -> None:
+        """Close the shell and wait for the adb process to exit."""
+        try:
+            self.proc.stdin.close()
+            self.proc.wait(timeout=2)
+        except (OSError, subprocess.TimeoutExpired):
+            self.proc.kill()
+
+
+def _ensure_server() -> None:
+    """
+    Start the adb server once before the first adb command.
+
+    This primes the daemon on localhost:5037 so later adb calls connect to a
+    running server instead of each probing for it and bringing it up.
+    """
+    global _server_started
+    if _server_started:
+        return
+    _server_started = True
+    try:
+        subprocess.run(["adb", "start-server"], **_QUIET, timeout=5)
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        # Leave error reporting to the actual command
+        pass
+
+
+def stop_server() -> None:
+    """Close all persistent shells and stop the adb server."""
+    global _server_started
+    _close_shells()
+    _server_started = False
+    try:
+        subprocess.run(["adb", "kill-server"], **_QUIET, timeout=5)
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        pass
+
+
+def _shell(device_id: DeviceHandle | str | None = None) -> _AdbShell:
+    """Get the persistent shell for a device, starting it on first use."""
+    device_id = _resolve_device(device_id)
+    shell = _shells.get(device_id)
+    if shell is None or not shell.is_alive():
+        shell = _AdbShell(device_id)
+        _shells[device_id] = shell
+    return shell
+
+
+def _close_shells() -> None:
+    """Close every persistent shell opened by this module."""
+    for shell in list(_shells.values()):
+        shell.close()
+    _shells.clear()
+
+
+atexit.register(_close_shells)
+
+
+def invalidate_device_cache(device_id: DeviceHandle | str | None = None) -> None:
+    """
+    Forget cached device info (root state, touch device, resolution).
+
+    Args:
+        device_id: Device whose entries to drop. If None, drops entries for all devices.
+    """
+    if device_id is None:
+        _device_cache.invalidate(all_devices=True)
+    else:
+        _device_cache.invalidate(_resolve_device(device_id))
+
+
+def on_device_reconnect(device_id: DeviceHandle | str | None = None) -> None:
+    """
+    Reset per-device state after a device was reconnected.
+
+    Drops cached device info and closes the persistent shell so the next command
+    opens a fresh session on the new transport.
+
+    Args:
+        device_id: Optional ADB device ID.
+    """
+    global _default_serial, _default_retry_at
+    device_id = _resolve_device(device_id)
+    _default_serial = None
+    _default_retry_at = 0.0
+    _device_cache.invalidate(device_id)
+    shell = _shells.pop(device_id, None)
+    if shell is not None:
+        shell.close()
+
+
+@contextlib.contextmanager
+def device_sequence(device_id: DeviceHandle | str | None = None) -> Iterator[str | None]:
+    """
+    Run a sequence of actions with their settle delays moved onto the device.
+
+    Inside the block, the delay after each action is not slept on the host. It runs
+    as a ``sleep`` in front of the device's next command, and action commands are
+    submitted without waiting for them to finish. The remaining delay is flushed
+    when the block exits.
+
+    Args:
+        device_id: Optional ADB device ID.
+
+    Yields:
+        Resolved device ID to pass to the actions. Root and touch state are only
+        probed if an action needs them.
+
+    Example:
+        >>> with device_sequence("emulator-5554") as device:
+        ...     tap(500, 800, device)
+        ...     back(device)
+    """
+    serial = _resolve_device(device_id)
+    if serial in _pending_delays:
+        # Nested sequence: the outer one flushes
+        yield serial
+        return
+
+    _pending_delays[serial] = 0.0
+    try:
+        yield serial
+    finally:
+        # Runs the last delay and waits for every submitted command
+        _shell(serial).run(":", quiet=True)
+        _pending_delays.pop(serial, None)
+
+
+def _settle(device_id: DeviceHandle | str | None, delay: float) -> None:
+    """Wait after an action, deferring the wait to the device inside device_sequence()."""
+    serial = _resolve_device(device_id)
+    if serial in _pending_delays:
+        _pending_delays[serial] += delay
+    else:
+        time.sleep(delay)
+
+
+def _shell_batch(
+    device_id: DeviceHandle | str | None,
+    cmds: list[str],
+    inter_delay_ms: int = 0,
+    wait: bool = True,
+) -> int:
+    """
+    Run several shell commands in a single round trip.
+
+    Args:
+        device_id: Optional ADB device ID.
+        cmds: Commands to run in order, already quoted for the device shell.
+        inter_delay_ms: Device-side pause between consecutive commands.
+        wait: If False, return as soon as the commands are submitted.
+
+    Returns:
+        Return code of the last command, or 0 if not waited for.
+    """
+    separator = f"; sleep {inter_delay_ms / 1000:g}; " if inter_delay_ms > 0 else "; "
+    returncode, _ = _shell(device_id).run(separator.join(cmds), quiet=True, wait=wait)
+    return returncode
+
+
+def _submit(device_id: DeviceHandle | str | None, cmds: list[str], inter_delay_ms: int = 0) -> None:
+    """Run action commands, without waiting for them inside device_sequence()."""
+    wait = _resolve_device(device_id) not in _pending_delays
+    _shell_batch(device_id, cmds, inter_delay_ms, wait=wait)
+
+
+def _is_device_rooted(device_id: DeviceHandle | str | None = None) -> bool:
+    """Check if device has root access."""
+    if isinstance(device_id, DeviceHandle):
+        return device_id.rooted
+    device_id = _resolve_device(device_id)
+    cache_key = ("rooted", device_id)
+    cached = _device_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    returncode, output = _shell(device_id).run("su -c id")
+    rooted = returncode == 0 and b"uid=0" in output
+    _device_cache.set(cache_key, rooted)
     return rooted
 
 
-def _get_touch_device(device_id: str | None = None) -> str | None:
+def _get_touch_device(device_id: DeviceHandle | str | None = None) -> str | None:
     """Find the touch input device path."""
-    cache_key = f"touch_device_{device_id}"
-    if cache_key in _device_cache:
-        return _device_cache[cache_key]
+    if isinstance(device_id, DeviceHandle) and device_id.touch_device:
+        return device_id.touch_device
+    device_id = _resolve_device(device_id)
+    cache_key = ("touch_device", device_id)
+    cached = _device_cache.get(cache_key)
+    if cached is not None:
+        return cached
 
-    adb_prefix = _get_adb_prefix(device_id)
-    result = subprocess.run(
-        adb_prefix + ["shell", "getevent", "-pl"], capture_output=True, text=True
-    )
+    _, output = _shell(device_id).run(_TOUCH_PROBE_CMD)
 
-    current_device = None
-    for line in result.stdout.split("\n"):
-        if line.startswith("add device"):
-            parts = line.split(":")
-            if len(parts) >= 2:
-                current_device = parts[1].strip()
-        elif "ABS_MT_POSITION_X" in line and current_device:
-            _device_cache[cache_key] = current_device
-            return current_device
+    match = _TOUCH_DEVICE_RE.search(output)
+    if not match:
+        return None
 
-    return None
+    touch_device = match.group(1).decode()
+    _device_cache.set(cache_key, touch_device)
+    return touch_device
 
 
-def _get_screen_resolution(device_id: str | None = None) -> tuple[int, int]:
+def _get_screen_resolution(device_id: DeviceHandle | str | None = None) -> tuple[int, int]:
     """Get device screen resolution."""
-    cache_key = f"resolution_{device_id}"
-    if cache_key in _device_cache:
-        return _device_cache[cache_key]
+    if isinstance(device_id, DeviceHandle):
+        return device_id.width, device_id.height
+    device_id = _resolve_device(device_id)
+    cache_key = ("resolution", device_id)
+    cached = _device_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    _, output = _shell(device_id).run("wm size")
 
-    adb_prefix = _get_adb_prefix(device_id)
-    result = subprocess.run(adb_prefix + ["shell", "wm", "size"], capture_output=True, text=True)
+    match = _RESOLUTION_RE.search(output)
+    if not match:
+        return (1080, 2400)
 
-    for line in result.stdout.split("\n"):
-        if "size" in line.lower():
-            parts = line.split(":")
-            if len(parts) >= 2:
-                size = parts[1].strip()
-                w, h = size.split("x")
-                resolution = (int(w), int(h))
-                _device_cache[cache_key] = resolution
-                return resolution
+    resolution = (int(match.group(1)), int(match.group(2)))
+    _device_cache.set(cache_key, resolution)
+    return resolution
 
-    return (1080, 2400)
+
+def get_device(device_id: DeviceHandle | str | None = None) -> DeviceHandle:
+    """
+    Get the resolved state of a device.
+
+    Args:
+        device_id: Optional ADB device ID. A handle is returned unchanged.
+
+    Returns:
+        DeviceHandle with the ADB prefix, root state, touch device (rooted devices
+        only) and screen resolution, cached with the rest of the device info once
+        every probe has succeeded.
+    """
+    if isinstance(device_id, DeviceHandle):
+        return device_id
+
+    serial = _resolve_device(device_id)
+    cache_key = ("handle", serial)
+    cached = _device_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    rooted = _is_device_rooted(serial)
+    touch_device = _get_touch_device(serial) if rooted else None
+    width, height = _get_screen_resolution(serial)
+    device = DeviceHandle(
+        device_id=serial,
+        adb_prefix=_get_adb_prefix(serial),
+        rooted=rooted,
+        touch_device=touch_device,
+        width=width,
+        height=height,
+    )
+    # Failed touch device or resolution probes are retried by the next lookup
+    if (touch_device or not rooted) and _device_cache.get(("resolution", serial)):
+        _device_cache.set(cache_key, device)
+    return device
+
+
+def _install_tap_script(device_id: DeviceHandle | str | None = None) -> bool:
+    """Write the sendevent tap script to the device once per cache lifetime."""
+    device_id = _resolve_device(device_id)
+    cache_key = ("tap_script", device_id)
+    if _device_cache.get(cache_key):
+        return True
+
+    returncode, _ = _shell(device_id).run(
+        f"cat > {_TAP_SCRIPT_PATH} <<'PHONE_AGENT_EOF'\n{_TAP_SCRIPT}PHONE_AGENT_EOF\n"
+        f"chmod 755 {_TAP_SCRIPT_PATH}",
+        quiet=True,
+    )
+    if returncode != 0:
+        return False
+
+    _device_cache.set(cache_key, True)
+    return True
+
+
+@functools.lru_cache(maxsize=16)
+def _fast_tap_template(touch_device: str) -> str:
+    """Build the ``su -c`` command for a non-humanized tap, formatted with (x, y)."""
+    script_cmd = shlex.join(["sh", _TAP_SCRIPT_PATH, touch_device]).replace("%", "%%")
+    # Integers never need shell quoting, so quote once with the placeholders in place
+    return shlex.join(["su", "-c", f"{script_cmd} %d %d 255 100"])
 
 
 def _sendevent_tap(
     x: int,
     y: int,
-    device_id: str | None = None,
+    device_id: DeviceHandle | str | None = None,
     humanize: bool = True,
 ) -> bool:
     """Perform a realistic tap using sendevent (requires root)."""
     touch_device = _get_touch_device(device_id)
-    if not touch_device:
+    if not touch_device or not _install_tap_script(device_id):
         return False
 
-    screen_w, screen_h = _get_screen_resolution(device_id)
-
-    # Add human-like variations
-    if humanize:
-        x += random.randint(-3, 3)
-        y += random.randint(-3, 3)
-        pressure = random.randint(180, 255)
-        touch_major = random.randint(80, 150)
-    else:
-        pressure = 255
-        touch_major = 100
-
-    # Event constants
-    EV_SYN, EV_KEY, EV_ABS = 0, 1, 3
-    SYN_REPORT, BTN_TOUCH = 0, 330
-    ABS_MT_TRACKING_ID, ABS_MT_POSITION_X, ABS_MT_POSITION_Y = 57, 53, 54
-    ABS_MT_TOUCH_MAJOR, ABS_MT_PRESSURE = 48, 58
-
-    # Build event sequence
-    events = [
-        f"sendevent {touch_device} {EV_ABS} {ABS_MT_TRACKING_ID} 0",
-        f"sendevent {touch_device} {EV_ABS} {ABS_MT_POSITION_X} {x}",
-        f"sendevent {touch_device} {EV_ABS} {ABS_MT_POSITION_Y} {y}",
-        f"sendevent {touch_device} {EV_ABS} {ABS_MT_TOUCH_MAJOR} {touch_major}",
-        f"sendevent {touch_device} {EV_ABS} {ABS_MT_PRESSURE} {pressure}",
-        f"sendevent {touch_device} {EV_KEY} {BTN_TOUCH} 1",
-        f"sendevent {touch_device} {EV_SYN} {SYN_REPORT} 0",
-    ]
-
-    # Add micro movement for realism
-    if humanize and random.random() > 0.3:
-        micro_x = x + random.randint(-2, 2)
-        micro_y = y + random.randint(-2, 2)
-        events.extend(
-            [
-                f"sendevent {touch_device} {EV_ABS} {ABS_MT_POSITION_X} {micro_x}",
-                f"sendevent {touch_device} {EV_ABS} {ABS_MT_POSITION_Y} {micro_y}",
-                f"sendevent {touch_device} {EV_SYN} {SYN_REPORT} 0",
-            ]
-        )
+    if not humanize:
+        return _shell_batch(device_id, [_fast_tap_template(touch_device) % (x, y)]) == 0
 
-    # Touch up
-    events.extend(
-        [
-            f"sendevent {touch_device} {EV_ABS} {ABS_MT_TRACKING_ID} -1",
-            f"sendevent {touch_device} {EV_KEY} {BTN_TOUCH} 0",
-            f"sendevent {touch_device} {EV_SYN} {SYN_REPORT} 0",
-        ]
-    )
+    # Add human-like variations, all drawn from one 64-bit sample.
+    # Fields are at least 7 bits wide so the modulo bias stays small.
+    bits = random.getrandbits(64)
+    x += (bits & 0x3FF) % 7 - 3  # -3..3
+    y += ((bits >> 10) & 0x3FF) % 7 - 3  # -3..3
+    pressure = 180 + ((bits >> 20) & 0x3FF) % 76  # 180..255
+    touch_major = 80 + ((bits >> 30) & 0x3FF) % 71  # 80..150
+    args = [touch_device, x, y, pressure, touch_major]
 
-    shell_script = " && ".join(events)
+    # Add micro movement for realism on ~70% of taps
+    if ((bits >> 40) & 0x3FF) < 717:
+        args.append(x + ((bits >> 50) & 0x7F) % 5 - 2)  # -2..2
+        args.append(y + ((bits >> 57) & 0x7F) % 5 - 2)  # -2..2
 
     # Random pre-tap delay
-    if humanize:
-        time.sleep(random.uniform(0.05, 0.15))
-
-    adb_prefix = _get_adb_prefix(device_id)
-    result = subprocess.run(
-        adb_prefix + ["shell", "su", "-c", f"'{shell_script}'"], capture_output=True, text=True
-    )
+    _settle(device_id, random.uniform(0.05, 0.15))
 
-    return result.returncode == 0
+    script_cmd = shlex.join(["sh", _TAP_SCRIPT_PATH, *map(str, args)])
+    return _shell_batch(device_id, [shlex.join(["su", "-c", script_cmd])]) == 0
 
 
-def get_current_app(device_id: str | None = None) -> str:
+def get_current_app(device_id: DeviceHandle | str | None = None) -> str:
     """
     Get the currently focused app name.
 
@@ -162,27 +609,26 @@ def get_current_app(device_id: str | None = None) -> str:
     Returns:
         The app name if recognized, otherwise "System Home".
     """
-    adb_prefix = _get_adb_prefix(device_id)
+    _, output = _shell(device_id).run(_FOCUS_CMD)
+    return _parse_current_app(output)
 
-    result = subprocess.run(
-        adb_prefix + ["shell", "dumpsys", "window"], capture_output=True, text=True
-    )
-    output = result.stdout
 
-    # Parse window focus info
-    for line in output.split("\n"):
-        if "mCurrentFocus" in line or "mFocusedApp" in line:
-            for app_name, package in APP_PACKAGES.items():
-                if package in line:
-                    return app_name
+def _parse_current_app(output: bytes) -> str:
+    """Map the focus lines of ``dumpsys window`` to the focused app name."""
+    if _PKG_AUTOMATON is not None:
+        # Longest match at the leftmost position, like the longest-first regex
+        for _, name in _PKG_AUTOMATON.iter_long(output.decode(errors="replace")):
+            return name
+        return "System Home"
 
-    return "System Home"
+    match = _PKG_RE.search(output)
+    return _PKG_TO_NAME[match.group(1)] if match else "System Home"
 
 
 def tap(
     x: int,
     y: int,
-    device_id: str | None = None,
+    device_id: DeviceHandle | str | None = None,
     delay: float | None = None,
     use_sendevent: bool = True,
 ) -> None:
@@ -214,7 +660,7 @@ def tap(
                 x,
                 y,
             )
-            time.sleep(delay)
+            _settle(device_id, delay)
             return
         _logger.warning(
             "[adb.device] tap | sendevent_failed | fallback_input_tap | device_id=%s | x=%s | y=%s",
@@ -224,12 +670,16 @@ def tap(
         )
 
     # Fallback to regular input tap
-    adb_prefix = _get_adb_prefix(device_id)
-    subprocess.run(adb_prefix + ["shell", "input", "tap", str(x), str(y)], capture_output=True)
-    time.sleep(delay)
+    _submit(device_id, [shlex.join(["input", "tap", str(x), str(y)])])
+    _settle(device_id, delay)
 
 
-def double_tap(x: int, y: int, device_id: str | None = None, delay: float | None = None) -> None:
+def double_tap(
+    x: int,
+    y: int,
+    device_id: DeviceHandle | str | None = None,
+    delay: float | None = None,
+) -> None:
     """
     Double tap at the specified coordinates.
 
@@ -242,19 +692,61 @@ def double_tap(x: int, y: int, device_id: str | None = None, delay: float | None
     if delay is None:
         delay = TIMING_CONFIG.device.default_double_tap_delay
 
-    adb_prefix = _get_adb_prefix(device_id)
+    tap_cmd = shlex.join(["input", "tap", str(x), str(y)])
+    _submit(
+        device_id,
+        [tap_cmd, tap_cmd],
+        int(TIMING_CONFIG.device.double_tap_interval * 1000),
+    )
+    _settle(device_id, delay)
+
+
+def tap_many(
+    points: list[tuple[int, int]],
+    device_id: DeviceHandle | str | None = None,
+    interval: float | None = None,
+    delay: float | None = None,
+    use_sendevent: bool = True,
+) -> None:
+    """
+    Tap a sequence of coordinates.
+
+    Args:
+        points: (x, y) coordinates to tap, in order.
+        device_id: Optional ADB device ID.
+        interval: Pause in seconds between taps. If None, uses configured default.
+        delay: Delay in seconds after the last tap. If None, uses configured default.
+        use_sendevent: If True and device is rooted, use sendevent for anti-detection.
+
+    Note:
+        Without sendevent, all taps are sent to the device as one batched command.
+    """
+    if interval is None:
+        interval = TIMING_CONFIG.device.multi_tap_interval
+    if delay is None:
+        delay = TIMING_CONFIG.device.default_tap_delay
+
+    if not points:
+        return
 
-    subprocess.run(adb_prefix + ["shell", "input", "tap", str(x), str(y)], capture_output=True)
-    time.sleep(TIMING_CONFIG.device.double_tap_interval)
-    subprocess.run(adb_prefix + ["shell", "input", "tap", str(x), str(y)], capture_output=True)
-    time.sleep(delay)
+    if use_sendevent and _is_device_rooted(device_id):
+        # Humanized sendevent taps are randomized individually
+        for x, y in points:
+            tap(x, y, device_id, delay=interval)
+    else:
+        _submit(
+            device_id,
+            [shlex.join(["input", "tap", str(x), str(y)]) for x, y in points],
+            int(interval * 1000),
+        )
+    _settle(device_id, delay)
 
 
 def long_press(
     x: int,
     y: int,
     duration_ms: int = 3000,
-    device_id: str | None = None,
+    device_id: DeviceHandle | str | None = None,
     delay: float | None = None,
 ) -> None:
     """
@@ -270,13 +762,11 @@ def long_press(
     if delay is None:
         delay = TIMING_CONFIG.device.default_long_press_delay
 
-    adb_prefix = _get_adb_prefix(device_id)
-
-    subprocess.run(
-        adb_prefix + ["shell", "input", "swipe", str(x), str(y), str(x), str(y), str(duration_ms)],
-        capture_output=True,
+    _submit(
+        device_id,
+        [shlex.join(["input", "swipe", str(x), str(y), str(x), str(y), str(duration_ms)])],
     )
-    time.sleep(delay)
+    _settle(device_id, delay)
 
 
 def swipe(
@@ -285,7 +775,7 @@ def swipe(
     end_x: int,
     end_y: int,
     duration_ms: int | None = None,
-    device_id: str | None = None,
+    device_id: DeviceHandle | str | None = None,
     delay: float | None = None,
 ) -> None:
     """
@@ -303,18 +793,11 @@ def swipe(
     if delay is None:
         delay = TIMING_CONFIG.device.default_swipe_delay
 
-    adb_prefix = _get_adb_prefix(device_id)
-
     if duration_ms is None:
-        # Calculate duration based on distance
-        dist_sq = (start_x - end_x) ** 2 + (start_y - end_y) ** 2
-        duration_ms = int(dist_sq / 1000)
-        duration_ms = max(1000, min(duration_ms, 2000))  # Clamp between 1000-2000ms
-
-    subprocess.run(
-        adb_prefix
-        + [
-            "shell",
+        duration_ms = _swipe_duration(start_x, start_y, end_x, end_y)
+
+    swipe_cmd = shlex.join(
+        [
             "input",
             "swipe",
             str(start_x),
@@ -322,13 +805,19 @@ def swipe(
             str(end_x),
             str(end_y),
             str(duration_ms),
-        ],
-        capture_output=True,
+        ]
     )
-    time.sleep(delay)
+    _submit(device_id, [swipe_cmd])
+    _settle(device_id, delay)
+
+
+def _swipe_duration(start_x: int, start_y: int, end_x: int, end_y: int) -> int:
+    """Calculate swipe duration in milliseconds based on distance."""
+    dist_sq = (start_x - end_x) ** 2 + (start_y - end_y) ** 2
+    return min(2000, max(1000, dist_sq // 1000))  # Clamp between 1000-2000ms
 
 
-def back(device_id: str | None = None, delay: float | None = None) -> None:
+def back(device_id: DeviceHandle | str | None = None, delay: float | None = None) -> None:
     """
     Press the back button.
 
@@ -339,13 +828,11 @@ def back(device_id: str | None = None, delay: float | None = None) -> None:
     if delay is None:
         delay = TIMING_CONFIG.device.default_back_delay
 
-    adb_prefix = _get_adb_prefix(device_id)
+    _submit(device_id, ["input keyevent 4"])
+    _settle(device_id, delay)
 
-    subprocess.run(adb_prefix + ["shell", "input", "keyevent", "4"], capture_output=True)
-    time.sleep(delay)
 
-
-def home(device_id: str | None = None, delay: float | None = None) -> None:
+def home(device_id: DeviceHandle | str | None = None, delay: float | None = None) -> None:
     """
     Press the home button.
 
@@ -356,88 +843,65 @@ def home(device_id: str | None = None, delay: float | None = None) -> None:
     if delay is None:
         delay = TIMING_CONFIG.device.default_home_delay
 
-    adb_prefix = _get_adb_prefix(device_id)
-
-    subprocess.run(adb_prefix + ["shell", "input", "keyevent", "KEYCODE_HOME"], capture_output=True)
-    time.sleep(delay)
+    _submit(device_id, ["input keyevent KEYCODE_HOME"])
+    _settle(device_id, delay)
 
 
-def wake_screen(device_id: str | None = None, verbose: bool = True) -> bool:
+def wake_screen(device_id: DeviceHandle | str | None = None, verbose: bool = True) -> bool:
     """
     Wake up the screen if it's off.
 
     Args:
         device_id: Optional ADB device ID.
-        verbose: If True, print when screen was already on; always print when wake was needed.
+        verbose: If True, log when screen was already on; always log when wake was needed.
 
     Returns:
         True if the screen was woken up (was off), False if already on.
     """
-    adb_prefix = _get_adb_prefix(device_id)
+    # Check and wake in a single round trip
+    _, output = _shell(device_id).run(_WAKE_SCRIPT)
+    woken = output.split()[-1:] == [b"WOKE"]
+    _report_wake(device_id, woken, verbose)
+    return woken
 
-    # Check if screen is already on
-    result = subprocess.run(
-        adb_prefix + ["shell", "dumpsys", "power"],
-        capture_output=True,
-        text=True,
-    )
 
-    # Check for screen state in dumpsys output
-    is_screen_on = "mWakefulness=Awake" in result.stdout or "Display Power: state=ON" in result.stdout
-
-    if is_screen_on:
-        if verbose:
-            print("📱 Screen is already on")
-        return False
-
-    # Wake up the screen using KEYCODE_WAKEUP (224)
-    subprocess.run(
-        adb_prefix + ["shell", "input", "keyevent", "KEYCODE_WAKEUP"],
-        capture_output=True,
-    )
-    time.sleep(0.5)
-    print("📱 Screen woken up")
-    return True
+def _report_wake(device_id: DeviceHandle | str | None, woken: bool, verbose: bool) -> None:
+    """Log the outcome of a wake attempt."""
+    if woken:
+        _logger.info("[adb.device] wake_screen | woken | device_id=%s", device_id or "default")
+    elif verbose:
+        _logger.info("[adb.device] wake_screen | already_on | device_id=%s", device_id or "default")
 
 
-def sleep_screen(device_id: str | None = None, verbose: bool = True) -> bool:
+def sleep_screen(device_id: DeviceHandle | str | None = None, verbose: bool = True) -> bool:
     """
     Turn off the screen (put device to sleep).
 
     Args:
         device_id: Optional ADB device ID.
-        verbose: If True, print status messages.
+        verbose: If True, log status messages.
 
     Returns:
         True if the screen was turned off (was on), False if already off.
     """
-    adb_prefix = _get_adb_prefix(device_id)
+    _, output = _shell(device_id).run(_SLEEP_SCRIPT)
 
-    result = subprocess.run(
-        adb_prefix + ["shell", "dumpsys", "power"],
-        capture_output=True,
-        text=True,
-    )
-
-    is_screen_on = "mWakefulness=Awake" in result.stdout or "Display Power: state=ON" in result.stdout
-
-    if not is_screen_on:
+    if output.split()[-1:] != [b"SLEPT"]:
         if verbose:
-            print("📱 Screen is already off")
+            _logger.info(
+                "[adb.device] sleep_screen | already_off | device_id=%s", device_id or "default"
+            )
         return False
 
-    subprocess.run(
-        adb_prefix + ["shell", "input", "keyevent", "KEYCODE_SLEEP"],
-        capture_output=True,
-    )
-    time.sleep(0.3)
     if verbose:
-        print("📱 Screen turned off")
+        _logger.info(
+            "[adb.device] sleep_screen | turned_off | device_id=%s", device_id or "default"
+        )
     return True
 
 
 def unlock_screen(
-    device_id: str | None = None,
+    device_id: DeviceHandle | str | None = None,
     swipe_up: bool = True,
     verbose: bool = True,
 ) -> bool:
@@ -450,59 +914,64 @@ def unlock_screen(
     Args:
         device_id: Optional ADB device ID.
         swipe_up: If True, swipe up to unlock. If False, swipe from left to right.
-        verbose: If True, print status; when False, only print if screen was woken from off.
+        verbose: If True, log status; when False, only log if screen was woken from off.
 
     Returns:
         True if unlock attempt was made, False if screen was already unlocked.
     """
-    adb_prefix = _get_adb_prefix(device_id)
-
-    wake_screen(device_id, verbose=verbose)
-    time.sleep(0.3)
-
-    result = subprocess.run(
-        adb_prefix + ["shell", "dumpsys", "window"],
-        capture_output=True,
-        text=True,
-    )
-
-    is_locked = "mDreamingLockscreen=true" in result.stdout or "isStatusBarKeyguard=true" in result.stdout
-
-    if not is_locked:
-        if verbose:
-            print("🔓 Screen is already unlocked")
-        return False
-
     screen_w, screen_h = _get_screen_resolution(device_id)
 
     if swipe_up:
         start_x = screen_w // 2
-        start_y = int(screen_h * 0.85)
+        start_y = screen_h * 85 // 100
         end_x = screen_w // 2
-        end_y = int(screen_h * 0.3)
+        end_y = screen_h * 30 // 100
     else:
-        start_x = int(screen_w * 0.2)
+        start_x = screen_w * 20 // 100
         start_y = screen_h // 2
-        end_x = int(screen_w * 0.8)
+        end_x = screen_w * 80 // 100
         end_y = screen_h // 2
 
-    subprocess.run(
-        adb_prefix + [
-            "shell", "input", "swipe",
-            str(start_x), str(start_y),
-            str(end_x), str(end_y),
+    swipe_cmd = shlex.join(
+        [
+            "input",
+            "swipe",
+            str(start_x),
+            str(start_y),
+            str(end_x),
+            str(end_y),
             "300",
-        ],
-        capture_output=True,
+        ]
     )
 
-    time.sleep(0.5)
+    # Wake, check the keyguard and swipe it away in a single round trip
+    _, output = _shell(device_id).run(
+        f"{_WAKE_SCRIPT}; sleep 0.3; "
+        f"if {_LOCKED_TEST}; then {swipe_cmd}; sleep 0.5; echo SWIPED; else echo UNLOCKED; fi"
+    )
+    status = output.split()
+    _report_wake(device_id, b"WOKE" in status, verbose)
+
+    if b"SWIPED" not in status:
+        if verbose:
+            _logger.info(
+                "[adb.device] unlock_screen | already_unlocked | device_id=%s",
+                device_id or "default",
+            )
+        return False
+
     if verbose:
-        print("🔓 Unlock swipe performed")
+        _logger.info(
+            "[adb.device] unlock_screen | swipe_performed | device_id=%s", device_id or "default"
+        )
     return True
 
 
-def launch_app(app_name: str, device_id: str | None = None, delay: float | None = None) -> bool:
+def launch_app(
+    app_name: str,
+    device_id: DeviceHandle | str | None = None,
+    delay: float | None = None,
+) -> bool:
     """
     Launch an app by name.
 
@@ -520,28 +989,228 @@ def launch_app(app_name: str, device_id: str | None = None, delay: float | None
     if app_name not in APP_PACKAGES:
         return False
 
-    adb_prefix = _get_adb_prefix(device_id)
     package = APP_PACKAGES[app_name]
 
-    subprocess.run(
-        adb_prefix
-        + [
-            "shell",
-            "monkey",
-            "-p",
-            package,
-            "-c",
-            "android.intent.category.LAUNCHER",
-            "1",
-        ],
-        capture_output=True,
+    _submit(
+        device_id,
+        [shlex.join(["monkey", "-p", package, "-c", "android.intent.category.LAUNCHER", "1"])],
     )
-    time.sleep(delay)
+    _settle(device_id, delay)
     return True
 
 
-def _get_adb_prefix(device_id: str | None) -> list:
+async def _arun(
+    device_id: DeviceHandle | str | None, *args: str, quiet: bool = False
+) -> tuple[int, bytes]:
+    """Run an ADB command without blocking the event loop."""
+    # Starting the server and looking up the default device run blocking adb calls
+    if not _server_started:
+        await asyncio.to_thread(_ensure_server)
+    adb_prefix = await asyncio.to_thread(_get_adb_prefix, device_id)
+    if quiet:
+        proc = await asyncio.create_subprocess_exec(*adb_prefix, *args, **_QUIET)
+        return await proc.wait(), b""
+
+    proc = await asyncio.create_subprocess_exec(
+        *adb_prefix,
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, _ = await proc.communicate()
+    return proc.returncode, stdout
+
+
+async def atap(
+    x: int,
+    y: int,
+    device_id: DeviceHandle | str | None = None,
+    delay: float | None = None,
+) -> None:
+    """
+    Tap at the specified coordinates without blocking the event loop.
+
+    Args:
+        x: X coordinate.
+        y: Y coordinate.
+        device_id: Optional ADB device ID.
+        delay: Delay in seconds after tap. If None, uses configured default.
+
+    Note:
+        Always uses ``input tap``; use tap() for the sendevent path on rooted devices.
+    """
+    if delay is None:
+        delay = TIMING_CONFIG.device.default_tap_delay
+
+    await _arun(device_id, "shell", "input", "tap", str(x), str(y), quiet=True)
+    await asyncio.sleep(delay)
+
+
+async def aswipe(
+    start_x: int,
+    start_y: int,
+    end_x: int,
+    end_y: int,
+    duration_ms: int | None = None,
+    device_id: DeviceHandle | str | None = None,
+    delay: float | None = None,
+) -> None:
+    """
+    Swipe from start to end coordinates without blocking the event loop.
+
+    Args:
+        start_x: Starting X coordinate.
+        start_y: Starting Y coordinate.
+        end_x: Ending X coordinate.
+        end_y: Ending Y coordinate.
+        duration_ms: Duration of swipe in milliseconds (auto-calculated if None).
+        device_id: Optional ADB device ID.
+        delay: Delay in seconds after swipe. If None, uses configured default.
+    """
+    if delay is None:
+        delay = TIMING_CONFIG.device.default_swipe_delay
+
+    if duration_ms is None:
+        duration_ms = _swipe_duration(start_x, start_y, end_x, end_y)
+
+    await _arun(
+        device_id,
+        "shell",
+        "input",
+        "swipe",
+        str(start_x),
+        str(start_y),
+        str(end_x),
+        str(end_y),
+        str(duration_ms),
+        quiet=True,
+    )
+    await asyncio.sleep(delay)
+
+
+async def aget_current_app(device_id: DeviceHandle | str | None = None) -> str:
+    """
+    Get the currently focused app name without blocking the event loop.
+
+    Args:
+        device_id: Optional ADB device ID for multi-device setups.
+
+    Returns:
+        The app name if recognized, otherwise "System Home".
+    """
+    _, output = await _arun(device_id, "shell", _FOCUS_CMD)
+    return _parse_current_app(output)
+
+
+async def gather_devices(
+    fn: Callable[..., Awaitable[Any]], device_ids: list[str], *args: Any, **kwargs: Any
+) -> list[Any]:
+    """
+    Run an async device function on several devices concurrently.
+
+    Args:
+        fn: Async function taking ``device_id`` as a keyword argument (e.g. atap).
+        device_ids: Devices to run on.
+        *args: Positional arguments passed to ``fn``.
+        **kwargs: Keyword arguments passed to ``fn``.
+
+    Returns:
+        Results of ``fn`` in the same order as ``device_ids``.
+
+    Example:
+        >>> asyncio.run(gather_devices(atap, ["emulator-5554", "3607f6cc"], 500, 800))
+    """
+    return list(await asyncio.gather(*(fn(*args, device_id=d, **kwargs) for d in device_ids)))
+
+
+def _default_device() -> str | None:
+    """
+    Get the serial of the only attached device.
+
+    The lookup runs `adb devices` once and is remembered for the process, so calls
+    without a device ID still target an explicit serial. Returns None when no device
+    or several devices are attached; that result is only kept for a couple of
+    seconds, so a single action does not repeat the lookup.
+    """
+    global _default_serial, _default_retry_at
+    if _default_serial is None and time.monotonic() >= _default_retry_at:
+        _ensure_server()
+        try:
+            result = subprocess.run(["adb", "devices"], capture_output=True, text=True, timeout=5)
+            output = result.stdout
+        except (FileNotFoundError, subprocess.TimeoutExpired):
+            output = ""
+        serials = [
+            line.split()[0] for line in output.splitlines()[1:] if line.strip().endswith("device")
+        ]
+        if len(serials) == 1:
+            _default_serial = serials[0]
+        else:
+            _default_retry_at = time.monotonic() + _DEFAULT_DEVICE_RETRY
+    return _default_serial
+
+
+def _resolve_device(device_id: DeviceHandle | str | None) -> str | None:
+    """Substitute the default device's serial or its network alias for a device ID."""
+    if isinstance(device_id, DeviceHandle):
+        # Handles made before enable_tcp() still follow the network alias
+        return _tcp_aliases.get(device_id.device_id, device_id.device_id)
+    if device_id in _tcp_aliases:
+        return _tcp_aliases[device_id]
+    serial = device_id or _default_device()
+    return _tcp_aliases.get(serial, serial)
+
+
+def enable_tcp(device_id: str | None = None, port: int = 5555) -> str | None:
+    """
+    Switch a USB-attached device to network ADB and route later commands over it.
+
+    After this, every helper called with the same device_id talks to the device over
+    TCP/IP, where the adb server multiplexes concurrent commands (e.g. from the async
+    helpers) without contending for the single USB endpoint.
+
+    Args:
+        device_id: Optional ADB device ID of a USB-attached device.
+        port: TCP port for ADB (default: 5555).
+
+    Returns:
+        The new "ip:port" device ID, or None if the switch failed.
+
+    Note:
+        Optional and LAN-only: the host must reach the device's WiFi address.
+    """
+    serial = _resolve_device(device_id)
+    conn = ADBConnection()
+
+    # Read the address while still on USB; tcpip restarts adbd on the device
+    ip = conn.get_device_ip(serial)
+    if ip is None:
+        return None
+
+    success, _ = conn.enable_tcpip(port, serial)
+    if not success:
+        return None
+
+    address = f"{ip}:{port}"
+    success, _ = conn.connect(address)
+    if not success:
+        return None
+
+    on_device_reconnect(serial)
+    _tcp_aliases[device_id] = address
+    if serial is not None:
+        _tcp_aliases[serial] = address
+    return address
+
+
+def _get_adb_prefix(device_id: DeviceHandle | str | None) -> tuple[str, ...]:
     """Get ADB command prefix with optional device specifier."""
-    if device_id:
-        return ["adb", "-s", device_id]
-    return ["adb"]
+    return _adb_prefix_for(_resolve_device(device_id))
+
+
+@functools.lru_cache(maxsize=16)
+def _adb_prefix_for(serial: str | None) -> tuple[str, ...]:
+    """Build the ADB command prefix for a resolved serial."""
+    if serial:
+        return ("adb", "-s", serial)
+    return ("adb",)
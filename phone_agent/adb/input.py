@@ -4,6 +4,8 @@ import base64
 import subprocess
 from typing import Optional
 
+from phone_agent.adb.device import _get_adb_prefix as _device_adb_prefix
+
 
 def type_text(text: str, device_id: str | None = None) -> None:
     """
@@ -103,7 +105,5 @@ def restore_keyboard(ime: str, device_id: str | None = None) -> None:
 
 
 def _get_adb_prefix(device_id: str | None) -> list:
-    """Get ADB command prefix with optional device specifier."""
-    if device_id:
-        return ["adb", "-s", device_id]
-    return ["adb"]
+    """Get ADB command prefix, following network aliases set by enable_tcp()."""
+    return list(_device_adb_prefix(device_id))
@@ -11,6 +11,8 @@ from typing import Tuple
 
 from PIL import Image
 
+from phone_agent.adb.device import _get_adb_prefix as _device_adb_prefix
+
 
 @dataclass
 class Screenshot:
@@ -86,10 +88,8 @@ def get_screenshot(device_id: str | None = None, timeout: int = 10) -> Screensho
 
 
 def _get_adb_prefix(device_id: str | None) -> list:
-    """Get ADB command prefix with optional device specifier."""
-    if device_id:
-        return ["adb", "-s", device_id]
-    return ["adb"]
+    """Get ADB command prefix, following network aliases set by enable_tcp()."""
+    return list(_device_adb_prefix(device_id))
 
 
 def _create_fallback_screenshot(is_sensitive: bool) -> Screenshot:
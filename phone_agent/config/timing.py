@@ -42,11 +42,13 @@ class DeviceTimingConfig:
     default_tap_delay: float = 1.0  # Default delay after tap
     default_double_tap_delay: float = 1.0  # Default delay after double tap
     double_tap_interval: float = 0.1  # Interval between two taps in double tap
+    multi_tap_interval: float = 0.1  # Interval between taps in a tap sequence
     default_long_press_delay: float = 1.0  # Default delay after long press
     default_swipe_delay: float = 1.0  # Default delay after swipe
     default_back_delay: float = 1.0  # Default delay after back button
     default_home_delay: float = 1.0  # Default delay after home button
     default_launch_delay: float = 1.0  # Default delay after launching app
+    device_cache_ttl: float = 600.0  # Seconds before cached device info is re-queried
 
     def __post_init__(self):
         """Load values from environment variables if present."""
@@ -59,6 +61,9 @@ class DeviceTimingConfig:
         self.double_tap_interval = float(
             os.getenv("PHONE_AGENT_DOUBLE_TAP_INTERVAL", self.double_tap_interval)
         )
+        self.multi_tap_interval = float(
+            os.getenv("PHONE_AGENT_MULTI_TAP_INTERVAL", self.multi_tap_interval)
+        )
         self.default_long_press_delay = float(
             os.getenv("PHONE_AGENT_LONG_PRESS_DELAY", self.default_long_press_delay)
         )
@@ -74,6 +79,9 @@ class DeviceTimingConfig:
         self.default_launch_delay = float(
             os.getenv("PHONE_AGENT_LAUNCH_DELAY", self.default_launch_delay)
         )
+        self.device_cache_ttl = float(
+            os.getenv("PHONE_AGENT_DEVICE_CACHE_TTL", self.device_cache_ttl)
+        )
 
 
 @dataclass
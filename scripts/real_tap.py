@@ -7,13 +7,131 @@ DingTalk (钉钉) to detect as automated taps.
 
 For rooted devices: Uses sendevent for low-level touch events.
 For non-rooted devices: Uses input swipe with timing variations.
+Optionally, taps can be streamed to a minitouch server over a socket.
 """
 
 import argparse
+import asyncio
+import atexit
+import functools
+import os
 import random
+import re
+import shlex
+import socket
 import subprocess
 import sys
+import tempfile
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator
+
+# Marker echoed after every command sent to a persistent shell
+SHELL_SENTINEL = b"__END__"
+
+# Touch ranges assumed when getevent doesn't report them
+DEFAULT_TOUCH_RANGES = {
+    "x_min": 0,
+    "x_max": 32767,
+    "y_min": 0,
+    "y_max": 32767,
+    "pressure_max": 255,
+    "touch_major_max": 255,
+}
+
+# Smallest touch axis maximum treated as normalized rather than panel pixels
+NORMALIZED_RANGE_MIN = 4095
+
+# getevent axis name -> key of its maximum in the touch ranges
+TOUCH_RANGE_KEYS = {
+    b"ABS_MT_POSITION_X": "x_max",
+    b"ABS_MT_POSITION_Y": "y_max",
+    b"ABS_MT_PRESSURE": "pressure_max",
+    b"ABS_MT_TOUCH_MAJOR": "touch_major_max",
+}
+
+# Linux input event constants
+EV_SYN, EV_KEY, EV_ABS = 0, 1, 3
+SYN_REPORT = 0
+BTN_TOUCH = 330
+ABS_MT_TRACKING_ID = 57
+ABS_MT_POSITION_X = 53
+ABS_MT_POSITION_Y = 54
+ABS_MT_TOUCH_MAJOR = 48
+ABS_MT_PRESSURE = 58
+
+# One sendevent call in a chained command built by sendevents()
+EVENT_FMT = b"sendevent %s %d %d %d && "
+
+# On-device script that plays one sendevent tap from positional arguments
+TAP_SCRIPT_PATH = "/data/local/tmp/_tap.sh"
+TAP_SCRIPT = f"""\
+# Usage: sh {TAP_SCRIPT_PATH} DEVICE X Y PRESSURE TOUCH_MAJOR [MICRO_X MICRO_Y]
+set -e
+d="$1"
+# Touch down
+sendevent "$d" {EV_ABS} {ABS_MT_TRACKING_ID} 0
+sendevent "$d" {EV_ABS} {ABS_MT_POSITION_X} "$2"
+sendevent "$d" {EV_ABS} {ABS_MT_POSITION_Y} "$3"
+sendevent "$d" {EV_ABS} {ABS_MT_TOUCH_MAJOR} "$5"
+sendevent "$d" {EV_ABS} {ABS_MT_PRESSURE} "$4"
+sendevent "$d" {EV_KEY} {BTN_TOUCH} 1
+sendevent "$d" {EV_SYN} {SYN_REPORT} 0
+# Slight finger movement
+if [ -n "$6" ]; then
+  sendevent "$d" {EV_ABS} {ABS_MT_POSITION_X} "$6"
+  sendevent "$d" {EV_ABS} {ABS_MT_POSITION_Y} "$7"
+  sendevent "$d" {EV_SYN} {SYN_REPORT} 0
+fi
+# Touch up
+sendevent "$d" {EV_ABS} {ABS_MT_TRACKING_ID} -1
+sendevent "$d" {EV_KEY} {BTN_TOUCH} 0
+sendevent "$d" {EV_SYN} {SYN_REPORT} 0
+"""
+
+# First API level whose input service answers `cmd input` directly
+CMD_INPUT_MIN_SDK = 31
+
+# Where prebuilt minitouch binaries are looked up, as minitouch/<abi>/minitouch
+MINITOUCH_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "minitouch")
+MINITOUCH_DEVICE_PATH = "/data/local/tmp/minitouch"
+# First local port forwarded to a device's minitouch socket
+MINITOUCH_BASE_PORT = 1111
+
+# Device header of `getevent -pl`, e.g. "add device 2: /dev/input/event2"
+_DEVICE_RE = re.compile(rb"^add device \d+: (\S+)", re.MULTILINE)
+# Axis line, e.g. "ABS_MT_POSITION_X : value 0, min 0, max 1079, fuzz 0, ..."
+_RANGE_RE = re.compile(rb"(ABS_MT_(?:POSITION_[XY]|PRESSURE|TOUCH_MAJOR))\b.*?max\s+(\d+)")
+# `wm size` output, e.g. "Physical size: 1080x2400"
+_RESOLUTION_RE = re.compile(rb"size.*?:\s*(\d+)x(\d+)", re.IGNORECASE)
+
+
+class Jitter:
+    """
+    Bounded random integers drawn from a single random sample.
+
+    One `getrandbits` call supplies all the variations of a tap, instead of a
+    full `random.randint` call per value. Each value takes a bit field wide
+    enough that the modulo bias stays below 1%.
+    """
+
+    def __init__(self, nbits: int = 256):
+        self.nbits = nbits
+        self.bits = random.getrandbits(nbits)
+        self.remaining = nbits
+
+    def randint(self, a: int, b: int) -> int:
+        """Return a random integer N such that a <= N <= b."""
+        n = b - a + 1
+        width = n.bit_length() + 7
+        if width > self.remaining:
+            self.bits = random.getrandbits(self.nbits)
+            self.remaining = self.nbits
+        value = self.bits & ((1 << width) - 1)
+        self.bits >>= width
+        self.remaining -= width
+        return a + value % n
 
 
 def get_adb_prefix(device_id: str | None = None) -> list[str]:
@@ -23,111 +141,349 @@ def get_adb_prefix(device_id: str | None = None) -> list[str]:
     return ["adb"]
 
 
-def run_adb(cmd: list[str], device_id: str | None = None) -> str:
+class AdbShell:
+    """
+    Long-lived `adb shell` session.
+
+    Commands are written to the shell's stdin and their output is read back up to
+    a sentinel line, so repeated commands don't each pay for a new adb process and
+    shell transport. With root=True the session runs `su` once and every command
+    is executed as root. Output is returned as raw bytes, which the parsers match
+    directly instead of decoding whole dumps. Calls from several threads take
+    turns on the session.
+    """
+
+    def __init__(self, device_id: str | None = None, root: bool = False):
+        self.device_id = device_id
+        self.root = root
+        self._lock = threading.Lock()
+        cmd = get_adb_prefix(device_id) + ["shell"] + (["su"] if root else [])
+        self.proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+        )
+
+    def __enter__(self) -> "AdbShell":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def is_alive(self) -> bool:
+        """Return True while the underlying adb process is running."""
+        return self.proc.poll() is None
+
+    def run(self, cmd: str | bytes, quiet: bool = False) -> tuple[bytes, int]:
+        """
+        Run a command and wait for it to finish.
+
+        Args:
+            cmd: Command line, already quoted for the device shell.
+            quiet: If True, discard the command's output on the device.
+
+        Returns:
+            Tuple of (combined stdout/stderr, return code). The return code is -1
+            if the session ended before the command completed.
+        """
+        redirect = b">/dev/null 2>&1" if quiet else b"2>&1"
+        # Group the command so stdin never reaches it and stderr is merged
+        if isinstance(cmd, str):
+            cmd = cmd.encode()
+        script = b"{ %s\n} </dev/null %s; echo %s$?\n" % (cmd, redirect, SHELL_SENTINEL)
+        with self._lock:
+            try:
+                self.proc.stdin.write(script)
+                self.proc.stdin.flush()
+            except OSError:
+                return b"", -1
+
+            lines = []
+            for line in self.proc.stdout:
+                index = line.rfind(SHELL_SENTINEL)
+                if index != -1:
+                    lines.append(line[:index])
+                    code = line[index + len(SHELL_SENTINEL) :].strip()
+                    return b"".join(lines), int(code) if code.isdigit() else -1
+                lines.append(line)
+            return b"".join(lines), -1
+
+    def close(self) -> None:
+        """Close the shell and wait for the adb process to exit."""
+        try:
+            self.proc.stdin.close()
+            self.proc.wait(timeout=2)
+        except (OSError, subprocess.TimeoutExpired):
+            self.proc.kill()
+
+
+# Open shell sessions, keyed by (device_id, root)
+_shells: dict[tuple[str | None, bool], AdbShell] = {}
+# Keeps concurrent callers from starting two sessions for the same device
+_shells_lock = threading.Lock()
+
+
+def get_shell(device_id: str | None = None, root: bool = False) -> AdbShell:
+    """Get the persistent shell for a device, starting it on first use."""
+    key = (device_id, root)
+    with _shells_lock:
+        shell = _shells.get(key)
+        if shell is None or not shell.is_alive():
+            shell = AdbShell(device_id, root)
+            _shells[key] = shell
+    return shell
+
+
+@atexit.register
+def close_shells():
+    """Close every persistent shell opened by this script."""
+    for shell in _shells.values():
+        shell.close()
+    _shells.clear()
+
+
+def run_adb(cmd: list[str], device_id: str | None = None) -> bytes:
     """Run an ADB command and return output."""
-    prefix = get_adb_prefix(device_id)
-    result = subprocess.run(prefix + cmd, capture_output=True, text=True)
-    return result.stdout
+    stdout, _, _ = run_adb_with_code(cmd, device_id)
+    return stdout
+
 
+def run_adb_with_code(cmd: list[str], device_id: str | None = None) -> tuple[bytes, bytes, int]:
+    """
+    Run an ADB command and return output, stderr, and return code.
+
+    `shell` commands go through the device's persistent shell, which merges
+    stderr into the output.
+    """
+    if cmd and cmd[0] == "shell":
+        output, code = get_shell(device_id).run(shlex.join(cmd[1:]))
+        return output, b"", code
 
-def run_adb_with_code(cmd: list[str], device_id: str | None = None) -> tuple[str, str, int]:
-    """Run an ADB command and return output, stderr, and return code."""
     prefix = get_adb_prefix(device_id)
-    result = subprocess.run(prefix + cmd, capture_output=True, text=True)
+    result = subprocess.run(prefix + cmd, capture_output=True)
     return result.stdout, result.stderr, result.returncode
 
 
+def run_adb_fire(cmd: list[str], device_id: str | None = None) -> int:
+    """
+    Run an ADB command whose output is not needed and return its exit code.
+
+    `shell` commands discard their output on the device; others run with
+    stdout/stderr on DEVNULL, so no pipes are created or read.
+    """
+    if cmd and cmd[0] == "shell":
+        _, code = get_shell(device_id).run(shlex.join(cmd[1:]), quiet=True)
+        return code
+
+    prefix = get_adb_prefix(device_id)
+    return subprocess.run(
+        prefix + cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    ).returncode
+
+
 def is_device_rooted(device_id: str | None = None) -> bool:
     """Check if device has root access."""
-    # Try running a simple command with su
-    stdout, stderr, code = run_adb_with_code(["shell", "su", "-c", "id"], device_id)
-    return code == 0 and "uid=0" in stdout
-
-
-def get_touch_device(device_id: str | None = None) -> str | None:
-    """Find the touch input device path."""
-    output = run_adb(["shell", "getevent", "-pl"], device_id)
-
-    current_device = None
-    for line in output.split("\n"):
-        if line.startswith("add device"):
-            # Extract device path like /dev/input/event2
-            parts = line.split(":")
-            if len(parts) >= 2:
-                current_device = parts[1].strip()
-        elif "ABS_MT_POSITION_X" in line and current_device:
-            return current_device
-
-    return None
-
-
-def get_screen_resolution(device_id: str | None = None) -> tuple[int, int]:
-    """Get device screen resolution."""
-    output = run_adb(["shell", "wm", "size"], device_id)
-    # Output format: "Physical size: 1080x2400"
-    for line in output.split("\n"):
-        if "size" in line.lower():
-            parts = line.split(":")
-            if len(parts) >= 2:
-                size = parts[1].strip()
-                w, h = size.split("x")
-                return int(w), int(h)
+    rooted, _, _ = probe_device(device_id)
+    return rooted
+
+
+def _device_blocks(output: bytes) -> Iterator[tuple[bytes, int, int]]:
+    """
+    Yield (device path, start, end) for each device block of a `getevent -pl` dump.
+
+    Blocks are found lazily and given as offsets into the dump, so callers that stop
+    at the first match don't scan or copy the rest.
+    """
+    headers = _DEVICE_RE.finditer(output)
+    header = next(headers, None)
+    while header is not None:
+        next_header = next(headers, None)
+        yield header.group(1), header.end(), next_header.start() if next_header else len(output)
+        header = next_header
+
+
+def probe_touch(device_id: str | None = None) -> tuple[str | None, dict]:
+    """
+    Find the touch input device and its coordinate ranges.
+
+    Returns:
+        Tuple of (device path like /dev/input/event2, ranges). The path is None
+        if no touch device was found, in which case default ranges are returned.
+    """
+    _, touch_device, ranges = probe_device(device_id)
+    return touch_device, ranges
+
+
+# Successful probe_device() and get_screen_resolution() results, keyed by device ID.
+# Failed probes are not kept, so the next call probes again.
+_probe_cache: dict[str | None, tuple[bool, str, dict]] = {}
+_resolution_cache: dict[str | None, tuple[int, int]] = {}
+
+
+def probe_device(device_id: str | None = None) -> tuple[bool, str | None, dict]:
+    """
+    Probe root access and the touch input device in a single round trip.
+
+    Runs `su -c id` and `getevent -pl` in one shell command. Root is detected
+    from the `id` output ahead of the dump, and the touch device is the first
+    device block that reports ABS_MT_POSITION_X.
+
+    Returns:
+        Tuple of (rooted, touch device path, touch ranges), as returned by
+        is_device_rooted() and probe_touch().
+    """
+    cached = _probe_cache.get(device_id)
+    if cached is not None:
+        return cached
+
+    output, code = get_shell(device_id).run("su -c id; getevent -pl")
+
+    first_header = output.find(b"add device")
+    rooted = b"uid=0" in output[: first_header if first_header != -1 else len(output)]
+
+    for path, start, end in _device_blocks(output):
+        found = {}
+        for match in _RANGE_RE.finditer(output, start, end):
+            found[TOUCH_RANGE_KEYS[match.group(1)]] = int(match.group(2))
+            if len(found) == len(TOUCH_RANGE_KEYS):
+                break
+        if "x_max" in found:
+            result = (rooted, path.decode(), {**DEFAULT_TOUCH_RANGES, **found})
+            if code == 0:
+                _probe_cache[device_id] = result
+            return result
+
+    return rooted, None, dict(DEFAULT_TOUCH_RANGES)
+
+
+def get_screen_resolution(device_id: str | None = None, oneshot: bool = False) -> tuple[int, int]:
+    """
+    Get device screen resolution.
+
+    With oneshot=True the query runs as its own adb process instead of on the
+    persistent shell, so it can overlap a command running there.
+    """
+    cached = _resolution_cache.get(device_id)
+    if cached is not None:
+        return cached
+
+    if oneshot:
+        cmd = get_adb_prefix(device_id) + ["shell", "wm", "size"]
+        output = subprocess.run(cmd, capture_output=True).stdout
+    else:
+        output = run_adb(["shell", "wm", "size"], device_id)
+    match = _RESOLUTION_RE.search(output)
+    if match:
+        resolution = int(match.group(1)), int(match.group(2))
+        _resolution_cache[device_id] = resolution
+        return resolution
     return 1080, 2400  # Default fallback
 
 
-def get_touch_range(device_id: str | None = None, device_path: str | None = None) -> dict:
-    """Get touch device coordinate ranges."""
-    output = run_adb(["shell", "getevent", "-pl"], device_id)
-
-    ranges = {
-        "x_min": 0,
-        "x_max": 32767,
-        "y_min": 0,
-        "y_max": 32767,
-        "pressure_max": 255,
-        "touch_major_max": 255,
-    }
-
-    in_target_device = False
-    for line in output.split("\n"):
-        if line.startswith("add device") and device_path and device_path in line:
-            in_target_device = True
-        elif line.startswith("add device") and in_target_device:
-            break
-        elif in_target_device:
-            if "ABS_MT_POSITION_X" in line:
-                # Parse: "value 0, min 0, max 1079, fuzz 0, flat 0, resolution 0"
-                if "max" in line:
-                    parts = line.split(",")
-                    for part in parts:
-                        if "max" in part:
-                            ranges["x_max"] = int(part.split()[-1])
-            elif "ABS_MT_POSITION_Y" in line:
-                if "max" in line:
-                    parts = line.split(",")
-                    for part in parts:
-                        if "max" in part:
-                            ranges["y_max"] = int(part.split()[-1])
-            elif "ABS_MT_PRESSURE" in line:
-                if "max" in line:
-                    parts = line.split(",")
-                    for part in parts:
-                        if "max" in part:
-                            ranges["pressure_max"] = int(part.split()[-1])
-            elif "ABS_MT_TOUCH_MAJOR" in line:
-                if "max" in line:
-                    parts = line.split(",")
-                    for part in parts:
-                        if "max" in part:
-                            ranges["touch_major_max"] = int(part.split()[-1])
-
-    return ranges
+@functools.lru_cache(maxsize=8)
+def get_sdk_level(device_id: str | None = None) -> int:
+    """Get the device's Android API level, or 0 if unknown."""
+    output = run_adb(["shell", "getprop", "ro.build.version.sdk"], device_id).strip()
+    return int(output) if output.isdigit() else 0
+
+
+def input_command(device_id: str | None = None) -> list[str]:
+    """
+    Get the command that injects input events on the device.
+
+    From Android 12 (API 31) the input service handles `cmd input` itself, which
+    skips starting the `input` tool; older releases only have `input`.
+    """
+    if get_sdk_level(device_id) >= CMD_INPUT_MIN_SDK:
+        return ["cmd", "input"]
+    return ["input"]
+
+
+def clear_device_cache():
+    """Forget cached probes and which devices already have the tap script."""
+    _tap_script_devices.clear()
+    _probe_cache.clear()
+    get_sdk_level.cache_clear()
+    _resolution_cache.clear()
+    tap_command_template.cache_clear()
+
+
+# Devices the tap script has been pushed to
+_tap_script_devices: set[str | None] = set()
+# Keeps concurrent taps from running the script while it is being pushed
+_tap_script_lock = threading.Lock()
+
+
+def install_tap_script(device_id: str | None = None) -> bool:
+    """
+    Push the tap script to the device once.
+
+    The script is written to a local file and copied with `adb push`, so its
+    body never goes through a device shell's parsing or quoting.
+    """
+    with _tap_script_lock:
+        if device_id in _tap_script_devices:
+            return True
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            local_path = os.path.join(tmp_dir, "_tap.sh")
+            with open(local_path, "w", newline="\n") as f:
+                f.write(TAP_SCRIPT)
+            _, _, code = run_adb_with_code(["push", local_path, TAP_SCRIPT_PATH], device_id)
+        if code != 0:
+            return False
+        _tap_script_devices.add(device_id)
+        return True
+
+
+@functools.lru_cache(maxsize=8)
+def tap_command_template(touch_device: str) -> str:
+    """
+    Build the tap script command for a touch device.
+
+    The script path and device are quoted once; each tap only fills in the
+    "%d" slots for X, Y, pressure and touch major.
+    """
+    return shlex.join(["sh", TAP_SCRIPT_PATH, touch_device]).replace("%", "%%") + " %d %d %d %d"
+
+
+def with_device_delays(cmd: str, pre_delay_us: int, post_delay_us: int) -> str:
+    """
+    Wrap a command with delays that are slept on the device.
+
+    The delays run in the same shell round trip as the command, instead of as
+    host-side sleeps around it. The command's exit status is preserved.
+    """
+    return f"usleep {pre_delay_us} && {cmd} && usleep {post_delay_us}"
 
 
 def sendevent(device_id: str | None, device_path: str, event_type: int, code: int, value: int):
     """Send a single event."""
-    cmd = ["shell", "sendevent", device_path, str(event_type), str(code), str(value)]
-    run_adb(cmd, device_id)
+    sendevents(device_id, device_path, [(event_type, code, value)])
+
+
+def sendevents(
+    device_id: str | None,
+    device_path: str,
+    events: Iterable[tuple[int, int, int]],
+    root: bool = False,
+) -> bool:
+    """
+    Send a sequence of (type, code, value) events in a single shell command.
+
+    The command is built straight into a byte buffer, stopping at the first
+    event that fails.
+
+    Returns:
+        True if every event was sent.
+    """
+    path = shlex.quote(device_path).encode()
+    buf = bytearray()
+    for event_type, code, value in events:
+        buf += EVENT_FMT % (path, event_type, code, value)
+    buf += b":"
+    _, code = get_shell(device_id, root=root).run(bytes(buf), quiet=True)
+    return code == 0
 
 
 def real_tap_swipe(
@@ -143,18 +499,40 @@ def real_tap_swipe(
     Uses a very short swipe with human-like timing to simulate a tap.
     This method is harder to detect than simple 'input tap'.
     """
+    output, code = get_shell(device_id).run(swipe_tap_command(x, y, device_id, verbose, humanize))
+
+    if code != 0:
+        print(f"❌ Error: {output.decode(errors='replace')}")
+        return False
+
+    if verbose:
+        print("✅ Tap completed (swipe method)")
+
+    return True
+
+
+def swipe_tap_command(
+    x: int,
+    y: int,
+    device_id: str | None = None,
+    verbose: bool = False,
+    humanize: bool = True,
+) -> str:
+    """Build the device command for a swipe-method tap, with its delays."""
+    rng = Jitter()
+
     # Add human-like variations
     if humanize:
         # Small random offset (±3 pixels)
-        x += random.randint(-3, 3)
-        y += random.randint(-3, 3)
+        x += rng.randint(-3, 3)
+        y += rng.randint(-3, 3)
 
         # Small random end position (finger micro-movement)
-        end_x = x + random.randint(-2, 2)
-        end_y = y + random.randint(-2, 2)
+        end_x = x + rng.randint(-2, 2)
+        end_y = y + rng.randint(-2, 2)
 
         # Random duration (80-180ms, human tap duration)
-        duration = random.randint(80, 180)
+        duration = rng.randint(80, 180)
     else:
         end_x = x
         end_y = y
@@ -164,32 +542,21 @@ def real_tap_swipe(
         print(f"👆 Tap at ({x}, {y}) using swipe method")
         print(f"   End pos: ({end_x}, {end_y}), Duration: {duration}ms")
 
-    # Add random pre-tap delay (50-200ms)
-    if humanize:
-        pre_delay = random.uniform(0.05, 0.20)
-        if verbose:
-            print(f"   Pre-delay: {int(pre_delay * 1000)}ms")
-        time.sleep(pre_delay)
-
-    prefix = get_adb_prefix(device_id)
-    result = subprocess.run(
-        prefix + ["shell", "input", "swipe", str(x), str(y), str(end_x), str(end_y), str(duration)],
-        capture_output=True,
-        text=True,
-    )
-
-    if result.returncode != 0:
-        print(f"❌ Error: {result.stderr}")
-        return False
+    swipe_args = ["swipe", str(x), str(y), str(end_x), str(end_y), str(duration)]
+    injector = input_command(device_id)
+    cmd = shlex.join([*injector, *swipe_args])
+    if injector != ["input"]:
+        # Retry with the input tool if the input service rejects the command
+        cmd = f"{{ {cmd} || {shlex.join(['input', *swipe_args])}; }}"
 
-    # Add random post-tap delay (30-100ms)
+    # Add random pre-tap (50-200ms) and post-tap (30-100ms) delays
     if humanize:
-        time.sleep(random.uniform(0.03, 0.10))
-
-    if verbose:
-        print("✅ Tap completed (swipe method)")
+        pre_delay_us = rng.randint(50_000, 200_000)
+        if verbose:
+            print(f"   Pre-delay: {pre_delay_us // 1000}ms")
+        cmd = with_device_delays(cmd, pre_delay_us, rng.randint(30_000, 100_000))
 
-    return True
+    return cmd
 
 
 def real_tap_sendevent(
@@ -214,39 +581,77 @@ def real_tap_sendevent(
     Returns:
         True if successful
     """
+    cmd = sendevent_tap_command(x, y, device_id, verbose, humanize)
+    if cmd is None:
+        return False
+
+    if not install_tap_script(device_id):
+        print("❌ Could not install tap script on device")
+        return False
+
+    output, code = get_shell(device_id, root=use_su).run(cmd)
+
+    if code != 0:
+        print(f"❌ Error: {output.decode(errors='replace')}")
+        return False
+
+    if verbose:
+        print("✅ Tap completed (sendevent method)")
+
+    return True
+
+
+def sendevent_tap_command(
+    x: int,
+    y: int,
+    device_id: str | None = None,
+    verbose: bool = False,
+    humanize: bool = True,
+) -> str | None:
+    """
+    Build the device command for a sendevent-method tap, with its delays.
+
+    Returns:
+        Command running the tap script, or None if no touch device was found.
+    """
     # Find touch device
-    touch_device = get_touch_device(device_id)
+    touch_device, ranges = probe_touch(device_id)
     if not touch_device:
         print("❌ Could not find touch input device")
-        return False
+        return None
 
     if verbose:
         print(f"📱 Touch device: {touch_device}")
 
-    # Get screen resolution and touch ranges
-    screen_w, screen_h = get_screen_resolution(device_id)
-    ranges = get_touch_range(device_id, touch_device)
+    # Get screen resolution. Panels reporting native pixel ranges already give it;
+    # normalized ranges (e.g. 4095 or 32767) need `wm size`.
+    if ranges["x_max"] < NORMALIZED_RANGE_MIN and ranges["y_max"] < NORMALIZED_RANGE_MIN:
+        screen_w, screen_h = ranges["x_max"] + 1, ranges["y_max"] + 1
+    else:
+        screen_w, screen_h = get_screen_resolution(device_id)
 
     if verbose:
         print(f"📐 Screen: {screen_w}x{screen_h}")
         print(f"📐 Touch range X: 0-{ranges['x_max']}, Y: 0-{ranges['y_max']}")
 
     # Convert screen coordinates to touch coordinates
-    touch_x = int(x * ranges["x_max"] / screen_w)
-    touch_y = int(y * ranges["y_max"] / screen_h)
+    touch_x = x * ranges["x_max"] // screen_w
+    touch_y = y * ranges["y_max"] // screen_h
+
+    rng = Jitter()
 
     # Add human-like variations
     if humanize:
         # Small random offset (±3 pixels equivalent)
-        offset_x = random.randint(-3, 3) * ranges["x_max"] // screen_w
-        offset_y = random.randint(-3, 3) * ranges["y_max"] // screen_h
+        offset_x = rng.randint(-3, 3) * ranges["x_max"] // screen_w
+        offset_y = rng.randint(-3, 3) * ranges["y_max"] // screen_h
         touch_x = max(0, min(ranges["x_max"], touch_x + offset_x))
         touch_y = max(0, min(ranges["y_max"], touch_y + offset_y))
 
         # Random pressure (70-100% of max)
-        pressure = random.randint(int(ranges["pressure_max"] * 0.7), ranges["pressure_max"])
-        touch_major = random.randint(
-            int(ranges["touch_major_max"] * 0.3), int(ranges["touch_major_max"] * 0.6)
+        pressure = rng.randint(ranges["pressure_max"] * 7 // 10, ranges["pressure_max"])
+        touch_major = rng.randint(
+            ranges["touch_major_max"] * 3 // 10, ranges["touch_major_max"] * 6 // 10
         )
     else:
         pressure = ranges["pressure_max"]
@@ -256,84 +661,195 @@ def real_tap_sendevent(
         print(f"👆 Tap at screen ({x}, {y}) -> touch ({touch_x}, {touch_y})")
         print(f"   Pressure: {pressure}, Touch size: {touch_major}")
 
-    # Event type constants
-    EV_SYN = 0
-    EV_KEY = 1
-    EV_ABS = 3
-
-    SYN_REPORT = 0
-
-    BTN_TOUCH = 330
-
-    ABS_MT_TRACKING_ID = 57
-    ABS_MT_POSITION_X = 53
-    ABS_MT_POSITION_Y = 54
-    ABS_MT_TOUCH_MAJOR = 48
-    ABS_MT_PRESSURE = 58
-
-    # Build the event sequence as a shell script for efficiency
-    events = [
-        # Touch down
-        f"sendevent {touch_device} {EV_ABS} {ABS_MT_TRACKING_ID} 0",
-        f"sendevent {touch_device} {EV_ABS} {ABS_MT_POSITION_X} {touch_x}",
-        f"sendevent {touch_device} {EV_ABS} {ABS_MT_POSITION_Y} {touch_y}",
-        f"sendevent {touch_device} {EV_ABS} {ABS_MT_TOUCH_MAJOR} {touch_major}",
-        f"sendevent {touch_device} {EV_ABS} {ABS_MT_PRESSURE} {pressure}",
-        f"sendevent {touch_device} {EV_KEY} {BTN_TOUCH} 1",
-        f"sendevent {touch_device} {EV_SYN} {SYN_REPORT} 0",
-    ]
+    # Play the whole event sequence with a single script invocation
+    cmd = tap_command_template(touch_device) % (touch_x, touch_y, pressure, touch_major)
 
     # Optional: Add slight finger movement (more realistic)
-    if humanize and random.random() > 0.3:
-        micro_move_x = touch_x + random.randint(-2, 2) * ranges["x_max"] // screen_w
-        micro_move_y = touch_y + random.randint(-2, 2) * ranges["y_max"] // screen_h
-        micro_move_x = max(0, min(ranges["x_max"], micro_move_x))
-        micro_move_y = max(0, min(ranges["y_max"], micro_move_y))
-
-        events.extend(
-            [
-                f"sendevent {touch_device} {EV_ABS} {ABS_MT_POSITION_X} {micro_move_x}",
-                f"sendevent {touch_device} {EV_ABS} {ABS_MT_POSITION_Y} {micro_move_y}",
-                f"sendevent {touch_device} {EV_SYN} {SYN_REPORT} 0",
-            ]
+    if humanize and rng.randint(0, 9) >= 3:
+        micro_move_x = touch_x + rng.randint(-2, 2) * ranges["x_max"] // screen_w
+        micro_move_y = touch_y + rng.randint(-2, 2) * ranges["y_max"] // screen_h
+        cmd += " %d %d" % (
+            max(0, min(ranges["x_max"], micro_move_x)),
+            max(0, min(ranges["y_max"], micro_move_y)),
         )
 
-    # Touch up
-    events.extend(
-        [
-            f"sendevent {touch_device} {EV_ABS} {ABS_MT_TRACKING_ID} -1",
-            f"sendevent {touch_device} {EV_KEY} {BTN_TOUCH} 0",
-            f"sendevent {touch_device} {EV_SYN} {SYN_REPORT} 0",
-        ]
-    )
+    # Add random pre-tap (50-150ms) and post-tap (30-100ms) delays
+    if humanize:
+        cmd = with_device_delays(cmd, rng.randint(50_000, 150_000), rng.randint(30_000, 100_000))
 
-    # Execute all events in a single shell command for better timing
-    shell_script = " && ".join(events)
+    return cmd
 
-    # Add random pre-tap delay (50-150ms)
-    if humanize:
-        time.sleep(random.uniform(0.05, 0.15))
 
-    prefix = get_adb_prefix(device_id)
+class MinitouchSession:
+    """
+    Connection to a minitouch server running on the device.
 
-    # Use su if needed
-    if use_su:
-        result = subprocess.run(
-            prefix + ["shell", "su", "-c", f"'{shell_script}'"], capture_output=True, text=True
+    The binary is pushed and started once, and its abstract socket is forwarded
+    to a local TCP port. Each tap is then a few protocol lines written to one
+    open socket instead of a new adb command.
+    """
+
+    def __init__(
+        self,
+        device_id: str | None = None,
+        port: int = MINITOUCH_BASE_PORT,
+        minitouch_dir: str = MINITOUCH_DIR,
+    ):
+        self.device_id = device_id
+        self.port = port
+
+        abi = run_adb(["shell", "getprop", "ro.product.cpu.abi"], device_id).strip().decode()
+        binary = os.path.join(minitouch_dir, abi, "minitouch")
+        if not os.path.isfile(binary):
+            raise FileNotFoundError(
+                f"minitouch binary for {abi or 'unknown ABI'} not found: {binary}"
+            )
+
+        _, stderr, code = run_adb_with_code(["push", binary, MINITOUCH_DEVICE_PATH], device_id)
+        if code != 0:
+            raise RuntimeError(f"Could not push minitouch: {stderr.decode(errors='replace')}")
+        run_adb_fire(["shell", "chmod", "755", MINITOUCH_DEVICE_PATH], device_id)
+
+        self.proc = subprocess.Popen(
+            get_adb_prefix(device_id) + ["shell", MINITOUCH_DEVICE_PATH],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
         )
-    else:
-        result = subprocess.run(prefix + ["shell", shell_script], capture_output=True, text=True)
+        run_adb_fire(["forward", f"tcp:{port}", "localabstract:minitouch"], device_id)
+        self.sock, banner = self._connect()
+
+        # Banner: "v <version>", "^ <contacts> <max-x> <max-y> <max-pressure>", "$ <pid>"
+        limits = next((line.split() for line in banner if line.startswith(b"^")), None)
+        if limits is None:
+            self.close()
+            raise RuntimeError("minitouch did not report its limits")
+        self.max_x, self.max_y, self.max_pressure = (int(v) for v in limits[2:5])
+
+    def _connect(self, attempts: int = 20) -> tuple[socket.socket, list[bytes]]:
+        """Connect to the forwarded port once minitouch is listening and read its banner."""
+        for _ in range(attempts):
+            try:
+                sock = socket.create_connection(("127.0.0.1", self.port), timeout=2)
+            except OSError:
+                time.sleep(0.1)
+                continue
+            reader = sock.makefile("rb")
+            banner = []
+            # The forward accepts before minitouch listens; an empty read means retry
+            while (line := reader.readline()) and not line.startswith(b"$"):
+                banner.append(line)
+            if banner:
+                return sock, banner
+            sock.close()
+            time.sleep(0.1)
+        self.close()
+        raise RuntimeError(f"Could not connect to minitouch on port {self.port}")
+
+    def send(self, commands: str) -> None:
+        """Write protocol commands, e.g. "d 0 10 10 50\\nc\\n", to the server."""
+        self.sock.sendall(commands.encode())
+
+    def close(self) -> None:
+        """Close the socket, stop the server and remove the port forward."""
+        sock = getattr(self, "sock", None)
+        if sock is not None:
+            sock.close()
+        self.proc.kill()
+        run_adb_fire(["forward", "--remove", f"tcp:{self.port}"], self.device_id)
+
+
+# Open minitouch sessions, keyed by device ID
+_minitouch_sessions: dict[str | None, MinitouchSession] = {}
+
+
+def get_minitouch(device_id: str | None = None) -> MinitouchSession:
+    """Get the minitouch session for a device, starting it on first use."""
+    session = _minitouch_sessions.pop(device_id, None)
+    if session is not None and session.proc.poll() is not None:
+        # The server exited; restart it on the same port
+        session.close()
+        session = MinitouchSession(device_id, session.port)
+    elif session is None:
+        ports = [other.port for other in _minitouch_sessions.values()]
+        session = MinitouchSession(device_id, max(ports, default=MINITOUCH_BASE_PORT - 1) + 1)
+    _minitouch_sessions[device_id] = session
+    return session
+
+
+@atexit.register
+def close_minitouch_sessions():
+    """Close every minitouch session opened by this script."""
+    for session in _minitouch_sessions.values():
+        session.close()
+    _minitouch_sessions.clear()
+
+
+def real_tap_minitouch(
+    x: int,
+    y: int,
+    device_id: str | None = None,
+    verbose: bool = False,
+    humanize: bool = True,
+) -> bool:
+    """
+    Perform a realistic tap through minitouch (no root needed on most devices).
+
+    Requires a prebuilt minitouch binary under MINITOUCH_DIR/<abi>/minitouch.
+    Delays are sent as minitouch `w` commands, so they run on the device.
 
-    if result.returncode != 0:
-        print(f"❌ Error: {result.stderr}")
+    Returns:
+        True if successful
+    """
+    try:
+        session = get_minitouch(device_id)
+    except (OSError, RuntimeError) as e:
+        print(f"❌ minitouch unavailable: {e}")
         return False
 
-    # Add random post-tap delay (30-100ms)
+    screen_w, screen_h = get_screen_resolution(device_id)
+    touch_x = x * session.max_x // screen_w
+    touch_y = y * session.max_y // screen_h
+    rng = Jitter()
+
     if humanize:
-        time.sleep(random.uniform(0.03, 0.10))
+        # Small random offset (±3 pixels equivalent)
+        touch_x += rng.randint(-3, 3) * session.max_x // screen_w
+        touch_y += rng.randint(-3, 3) * session.max_y // screen_h
+        touch_x = max(0, min(session.max_x, touch_x))
+        touch_y = max(0, min(session.max_y, touch_y))
+        pressure = rng.randint(session.max_pressure * 7 // 10, session.max_pressure)
+        # Random pre-tap delay (50-150ms)
+        commands = f"w {rng.randint(50, 150)}\nd 0 {touch_x} {touch_y} {pressure}\nc\n"
+
+        # Optional: Add slight finger movement (more realistic)
+        if rng.randint(0, 9) >= 3:
+            move_x = touch_x + rng.randint(-2, 2) * session.max_x // screen_w
+            move_y = touch_y + rng.randint(-2, 2) * session.max_y // screen_h
+            move_x = max(0, min(session.max_x, move_x))
+            move_y = max(0, min(session.max_y, move_y))
+            commands += f"m 0 {move_x} {move_y} {pressure}\nc\n"
+
+        # Random hold (40-90ms) and post-tap delay (30-100ms)
+        commands += f"w {rng.randint(40, 90)}\nu 0\nc\nw {rng.randint(30, 100)}\n"
+    else:
+        pressure = session.max_pressure
+        commands = f"d 0 {touch_x} {touch_y} {pressure}\nc\nu 0\nc\n"
 
     if verbose:
-        print("✅ Tap completed (sendevent method)")
+        print(f"👆 Tap at screen ({x}, {y}) -> touch ({touch_x}, {touch_y}) using minitouch")
+        print(f"   Pressure: {pressure}")
+
+    try:
+        session.send(commands)
+    except OSError as e:
+        print(f"❌ Error: {e}")
+        _minitouch_sessions.pop(device_id, None)
+        session.close()
+        return False
+
+    if verbose:
+        print("✅ Tap completed (minitouch method)")
 
     return True
 
@@ -355,7 +871,8 @@ def real_tap(
         device_id: ADB device ID
         verbose: Print debug info
         humanize: Add random variations to simulate human behavior
-        force_method: Force a specific method ('sendevent', 'swipe', or None for auto)
+        force_method: Force a specific method ('sendevent', 'swipe', 'minitouch',
+            or None for auto)
 
     Returns:
         True if successful
@@ -364,6 +881,8 @@ def real_tap(
         return real_tap_sendevent(x, y, device_id, verbose, humanize, use_su=True)
     elif force_method == "swipe":
         return real_tap_swipe(x, y, device_id, verbose, humanize)
+    elif force_method == "minitouch":
+        return real_tap_minitouch(x, y, device_id, verbose, humanize)
 
     # Auto-detect: try sendevent with root first, fallback to swipe
     rooted = is_device_rooted(device_id)
@@ -381,27 +900,95 @@ def real_tap(
         return real_tap_swipe(x, y, device_id, verbose, humanize)
 
 
+async def async_run_adb_with_code(
+    cmd: list[str], device_id: str | None = None
+) -> tuple[bytes, bytes, int]:
+    """Run an ADB command without blocking the event loop."""
+    proc = await asyncio.create_subprocess_exec(
+        *get_adb_prefix(device_id),
+        *cmd,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, stderr = await proc.communicate()
+    return stdout, stderr, proc.returncode
+
+
+async def async_run_adb(cmd: list[str], device_id: str | None = None) -> bytes:
+    """Run an ADB command without blocking the event loop and return output."""
+    stdout, _, _ = await async_run_adb_with_code(cmd, device_id)
+    return stdout
+
+
+async def async_real_tap(
+    x: int,
+    y: int,
+    device_id: str | None = None,
+    verbose: bool = False,
+    humanize: bool = True,
+    force_method: str | None = None,
+) -> bool:
+    """
+    Perform a realistic tap without blocking the event loop.
+
+    Same methods and arguments as real_tap(), so callers can `asyncio.gather`
+    taps on several devices. Each tap runs as its own adb process; the cached
+    probes and the one-time script push run in a worker thread.
+
+    Returns:
+        True if successful
+    """
+    method = force_method
+    if method is None:
+        rooted = await asyncio.to_thread(is_device_rooted, device_id)
+        method = "sendevent" if rooted else "swipe"
+        if verbose:
+            print(f"📱 Using {method} method")
+
+    if method == "sendevent":
+        cmd = await asyncio.to_thread(sendevent_tap_command, x, y, device_id, verbose, humanize)
+        if cmd is None or not await asyncio.to_thread(install_tap_script, device_id):
+            return False
+        adb_cmd = ["shell", "su", "-c", shlex.quote(cmd)]
+    else:
+        cmd = await asyncio.to_thread(swipe_tap_command, x, y, device_id, verbose, humanize)
+        adb_cmd = ["shell", cmd]
+
+    stdout, stderr, code = await async_run_adb_with_code(adb_cmd, device_id)
+    if code != 0:
+        print(f"❌ Error: {(stderr or stdout).decode(errors='replace')}")
+        return False
+
+    if verbose:
+        print(f"✅ Tap completed ({method} method)")
+
+    return True
+
+
 def show_device_info(device_id: str | None = None):
     """Display device touch input information."""
     print("=" * 60)
     print("📱 Device Touch Input Information")
     print("=" * 60)
 
+    # Query the resolution on its own adb process while the shell runs the device probe
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        resolution_future = executor.submit(get_screen_resolution, device_id, oneshot=True)
+        rooted, touch_device, ranges = probe_device(device_id)
+
     # Root status
-    rooted = is_device_rooted(device_id)
     print(
         f"\n🔐 Root Status: {'✅ Rooted (sendevent available)' if rooted else '❌ Not rooted (using swipe fallback)'}"
     )
 
     # Screen resolution
-    screen_w, screen_h = get_screen_resolution(device_id)
+    screen_w, screen_h = resolution_future.result()
     print(f"📐 Screen Resolution: {screen_w} x {screen_h}")
 
     # Touch device
-    touch_device = get_touch_device(device_id)
     if touch_device:
         print(f"🎯 Touch Device: {touch_device}")
-        ranges = get_touch_range(device_id, touch_device)
         print(f"   X Range: 0 - {ranges['x_max']}")
         print(f"   Y Range: 0 - {ranges['y_max']}")
         print(f"   Pressure Max: {ranges['pressure_max']}")
@@ -417,6 +1004,33 @@ def show_device_info(device_id: str | None = None):
     print("\n" + "=" * 60)
 
 
+def tap_stream(lines: Iterable[str], **tap_kwargs) -> int:
+    """
+    Tap every "x y" line of a stream in this process.
+
+    Probes and shell sessions are shared by all taps, so each tap after the
+    first costs a single shell command. Blank lines and lines starting with
+    "#" are skipped.
+
+    Returns:
+        Exit code: 0 if every tap succeeded, 1 otherwise.
+    """
+    failed = 0
+    for line_no, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            x, y = (int(v) for v in line.split())
+        except ValueError:
+            print(f'❌ Line {line_no}: expected "x y", got {line!r}')
+            failed += 1
+            continue
+        if not real_tap(x, y, **tap_kwargs):
+            failed += 1
+    return 1 if failed else 0
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Real tap simulation to bypass anti-bot detection",
@@ -437,6 +1051,12 @@ Examples:
   
   # Specify device
   python real_tap.py --x 500 --y 800 --device 3607f6cc
+
+  # Tap through minitouch (binaries in scripts/minitouch/<abi>/minitouch)
+  python real_tap.py --x 500 --y 800 --method minitouch
+
+  # Tap a stream of "x y" lines from stdin in one process
+  printf '500 800\n600 900\n' | python real_tap.py --stream
         """,
     )
 
@@ -446,6 +1066,14 @@ Examples:
     parser.add_argument("--device", "-d", type=str, help="ADB device ID")
     parser.add_argument("--verbose", "-v", action="store_true", help="Verbose output")
     parser.add_argument("--no-humanize", action="store_true", help="Disable human-like variations")
+    parser.add_argument(
+        "--stream", action="store_true", help='Read "x y" lines from stdin and tap each'
+    )
+    parser.add_argument(
+        "--method",
+        choices=["sendevent", "swipe", "minitouch"],
+        help="Force a tap method (default: auto-detect)",
+    )
 
     args = parser.parse_args()
 
@@ -453,6 +1081,15 @@ Examples:
         show_device_info(args.device)
         return 0
 
+    if args.stream:
+        return tap_stream(
+            sys.stdin,
+            device_id=args.device,
+            verbose=args.verbose,
+            humanize=not args.no_humanize,
+            force_method=args.method,
+        )
+
     if args.x is None or args.y is None:
         parser.print_help()
         print("\n❌ Error: --x and --y are required for tapping")
@@ -464,6 +1101,7 @@ Examples:
         device_id=args.device,
         verbose=args.verbose,
         humanize=not args.no_humanize,
+        force_method=args.method,
     )
 
     return 0 if success else 1
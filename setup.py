@@ -40,6 +40,9 @@ setup(
             "mypy>=1.0.0",
             "ruff>=0.1.0",
         ],
+        "fast": [
+            "pyahocorasick>=2.0",
+        ],
     },
     entry_points={
         "console_scripts": [